@@ -3,17 +3,23 @@ from .models import User_Info
 from django.utils.timezone import localtime
 import pytz
 
+# Built once at import time; pytz.timezone() does a lookup plus object
+# construction, so don't pay for it on every changelist row
+VANCOUVER_TZ = pytz.timezone('America/Vancouver')
+
 # Register your models here.
 
 @admin.register(User_Info)
 class UserInfoAdmin(admin.ModelAdmin):
     list_display = ('uid', 'name', 'mtext', 'response', 'display_vancouver_time', 'pic_url')
-    search_fields = ('uid', 'name', 'mtext', 'response')
+    # uid/name only: searching mtext/response does an unindexed LIKE over the
+    # whole table, which dominates changelist load once the log grows
+    search_fields = ('uid', 'name')
     list_filter = ('mdt',)
+    list_per_page = 50
 
     def display_vancouver_time(self, obj):
-        vancouver_tz = pytz.timezone('America/Vancouver')
-        return localtime(obj.mdt, vancouver_tz).strftime('%Y-%m-%d %H:%M:%S %Z')
+        return localtime(obj.mdt, VANCOUVER_TZ).strftime('%Y-%m-%d %H:%M:%S %Z')
     display_vancouver_time.short_description = 'MDT (Vancouver Time)'
 
 
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-09-01 23:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LineBot', '0005_userprofile_usernote_conversationsession_chatmessage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversationsession',
+            index=models.Index(fields=['user_profile', 'is_active'], name='conversatio_user_pr_d4c508_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernote',
+            index=models.Index(fields=['user_profile', 'is_archived', '-updated_at'], name='user_notes_user_pr_75c1c6_idx'),
+        ),
+    ]
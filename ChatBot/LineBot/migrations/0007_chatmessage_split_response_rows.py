@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.db import migrations
+
+
+def split_responses_into_rows(apps, schema_editor):
+    """Turn every stored assistant response into its own 'assistant' row"""
+    ChatMessage = apps.get_model('LineBot', 'ChatMessage')
+    pending = ChatMessage.objects.exclude(response__isnull=True).exclude(response='')
+    for msg in pending.iterator():
+        reply = ChatMessage.objects.create(
+            user_profile_id=msg.user_profile_id,
+            message_type='assistant',
+            content=msg.response,
+            is_processed=msg.is_processed,
+            processing_time=msg.processing_time,
+        )
+        # created_at is auto_now_add, so place the reply just after its
+        # user message with a direct update
+        ChatMessage.objects.filter(pk=reply.pk).update(
+            created_at=msg.created_at + timedelta(microseconds=1),
+            updated_at=msg.updated_at,
+        )
+
+
+def merge_rows_back(apps, schema_editor):
+    """Reverse is lossy by design; assistant rows simply stay as rows"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LineBot', '0006_conversationsession_conversatio_user_pr_d4c508_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_responses_into_rows, merge_rows_back),
+        migrations.RemoveField(
+            model_name='chatmessage',
+            name='response',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-09-01 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LineBot', '0007_chatmessage_split_response_rows'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user_info',
+            name='mtext',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='user_info',
+            name='response',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='user_info',
+            name='uid',
+            field=models.CharField(db_index=True, default='', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='user_info',
+            index=models.Index(fields=['uid', '-mdt'], name='LineBot_use_uid_7dde43_idx'),
+        ),
+    ]
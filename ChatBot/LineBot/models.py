@@ -21,6 +21,12 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.name} ({self.uid})"
 
+class ProfileRelatedManager(models.Manager):
+    """Manager that always joins the owning profile, so list views and
+    __str__ don't trigger one query per row"""
+    def get_queryset(self):
+        return super().get_queryset().select_related('user_profile')
+
 class ChatMessage(models.Model):
     """Model for storing chat messages with better structure"""
     MESSAGE_TYPES = [
@@ -34,12 +40,13 @@ class ChatMessage(models.Model):
     user_profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='messages')
     message_type = models.CharField(max_length=20, choices=MESSAGE_TYPES, default='user')
     content = models.TextField(validators=[MinLengthValidator(1)])
-    response = models.TextField(blank=True, null=True)  # For assistant responses
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_processed = models.BooleanField(default=False)
     processing_time = models.FloatField(null=True, blank=True)  # Time taken to process in seconds
-    
+
+    objects = ProfileRelatedManager()
+
     class Meta:
         db_table = 'chat_messages'
         ordering = ['-created_at']
@@ -68,6 +75,9 @@ class ConversationSession(models.Model):
     class Meta:
         db_table = 'conversation_sessions'
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['user_profile', 'is_active']),
+        ]
     
     def __str__(self):
         return f"Session {self.id}: {self.title or 'Untitled'}"
@@ -82,10 +92,15 @@ class UserNote(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_archived = models.BooleanField(default=False)
-    
+
+    objects = ProfileRelatedManager()
+
     class Meta:
         db_table = 'user_notes'
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['user_profile', 'is_archived', '-updated_at']),
+        ]
     
     def __str__(self):
         return f"{self.title or 'Untitled Note'} - {self.user_profile.name}"
@@ -93,12 +108,17 @@ class UserNote(models.Model):
 # Legacy model for backward compatibility
 class User_Info(models.Model):
     """Legacy model - kept for backward compatibility"""
-    uid = models.CharField(max_length=50, null=False, default='')  # user_id
+    uid = models.CharField(max_length=50, null=False, default='', db_index=True)  # user_id
     name = models.CharField(max_length=255, blank=True, null=False)  # LINE名字
-    mtext = models.CharField(max_length=255, blank=True, null=False)  # 文字訊息紀錄
+    mtext = models.TextField(blank=True, null=False)  # 文字訊息紀錄
     mdt = models.DateTimeField(auto_now=True)  # 儲存的日期時間
     pic_url = models.CharField(max_length=255, blank=True, null=True)  # Profile picture URL
-    response = models.CharField(max_length=255, blank=True, null=True)  # Agent's response
+    response = models.TextField(blank=True, null=True)  # Agent's response
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['uid', '-mdt']),
+        ]
 
     def __str__(self):
         return self.uid
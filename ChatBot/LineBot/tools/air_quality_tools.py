@@ -1,59 +1,113 @@
+import functools
+import mmap
 import os
 import csv
+import re
 from datetime import datetime
 from typing import Dict, List, Optional
-import statistics
+
+import numpy as np
+import pandas as pd
+
+from .smart_home_tools import cached_with_ttl, get_db_connection
+
+# One C-level scan extracts every field; lines that don't match (malformed,
+# truncated) are skipped, same as the old per-line tolerance
+_PT_LINE_RE = re.compile(
+    rb'Time:\s*([^,]+), Code:[^,]*, Label:\s*([^,]+), Unit:\s*([^,]+), Value:\s*([-\d.]+)'
+)
+
+@functools.lru_cache(maxsize=4)
+def _load_pt_file(file_path: str, mtime: float, max_lines: int) -> pd.DataFrame:
+    """Parse the 'key: value' PT file into a DataFrame with time/label/unit/value columns
+
+    Cached per (path, mtime, limit): the file is static historical data, so
+    repeated bot requests hit the parsed frame instead of re-reading the file.
+    Callers must treat the returned frame as read-only.
+    """
+    with open(file_path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            # Bound the scan to the first max_lines+1 lines, mirroring the
+            # old line_num cutoff
+            end = 0
+            for _ in range(max_lines + 1):
+                nxt = buf.find(b'\n', end)
+                if nxt == -1:
+                    end = len(buf)
+                    break
+                end = nxt + 1
+            rows = _PT_LINE_RE.findall(buf, 0, end)
+        finally:
+            buf.close()
+
+    df = pd.DataFrame(rows, columns=['time', 'label', 'unit', 'value'])
+    for col in ('time', 'label', 'unit'):
+        df[col] = df[col].str.decode('utf-8')
+    df['value'] = pd.to_numeric(df['value'].str.decode('ascii'), errors='coerce')
+    return df.dropna(subset=['label', 'value'])
+
+@functools.lru_cache(maxsize=4)
+def _load_pt_index(file_path: str, mtime: float, max_lines: int) -> Dict[str, Dict]:
+    """Columnar per-parameter index of the PT file.
+
+    Maps upper-cased label -> {'values': contiguous float32 array,
+    'recent_times': first five timestamps, 'unit': unit string}, built once per
+    (path, mtime, limit) so parameter queries are a dict lookup plus NumPy
+    reductions instead of a row re-scan.
+    """
+    df = _load_pt_file(file_path, mtime, max_lines)
+    index = {}
+    for label, group in df.groupby('label', sort=False):
+        values = group['value'].to_numpy(dtype=np.float32)
+        index[label.upper()] = {
+            'values': values,
+            # All reductions run once here, while the column is hot in cache;
+            # per-query statistics become dict reads. The median's introselect
+            # runs on np.median's internal copy (overwrite_input would reorder
+            # the shared array)
+            'mean': values.mean(),
+            'min': values.min(),
+            'max': values.max(),
+            'std': values.std(ddof=1),
+            'median': np.median(values),
+            'recent_times': tuple(group['time'].iloc[:5]),
+            # kept as plain floats so the chat output prints 561.92, not the
+            # float32 repr 561.9199829101562
+            'recent_values': tuple(group['value'].iloc[:5]),
+            'unit': group['unit'].iloc[0],
+        }
+    return index
 
 def analyze_historical_air_quality(parameter: str = "CO2", hours: int = 24) -> str:
     """Analyze historical air quality data from PT file for specific parameters"""
     file_path = r'c:\Users\USER\OneDrive\文件\capstone\PT_202505011759.txt'
-    
+
     if not os.path.exists(file_path):
         return "Historical air quality data file not found."
-    
+
     try:
         # Read and parse historical data
-        data_points = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f):
-                if line_num > 10000:  # Limit for performance
-                    break
-                
-                parts = line.strip().split(', ')
-                if len(parts) >= 6:
-                    # Parse: ID, Time, Code, Label, Unit, Value
-                    label = parts[3].split(': ')[1] if ': ' in parts[3] else ''
-                    if label.upper() == parameter.upper():
-                        try:
-                            time_str = parts[1].split(': ')[1]
-                            value_str = parts[5].split(': ')[1]
-                            value = float(value_str)
-                            data_points.append({
-                                'time': time_str,
-                                'value': value,
-                                'unit': parts[4].split(': ')[1] if ': ' in parts[4] else ''
-                            })
-                        except (ValueError, IndexError):
-                            continue
-        
-        if not data_points:
+        index = _load_pt_index(file_path, os.path.getmtime(file_path), 10000)  # Limit for performance
+        entry = index.get(parameter.upper())
+
+        if entry is None:
             return f"No historical data found for {parameter}."
-        
-        # Analyze the data
-        values = [dp['value'] for dp in data_points]
-        unit = data_points[0]['unit'] if data_points else ''
-        
-        analysis = f"📊 **Historical {parameter} Analysis** (Sample: {len(data_points):,} points)\n\n"
+
+        # Statistics were reduced once at index build; just format them
+        unit = entry['unit']
+
+        analysis = f"📊 **Historical {parameter} Analysis** (Sample: {len(entry['values']):,} points)\n\n"
         analysis += f"**Statistics:**\n"
-        analysis += f"  • Average: {statistics.mean(values):.2f} {unit}\n"
-        analysis += f"  • Minimum: {min(values):.2f} {unit}\n"
-        analysis += f"  • Maximum: {max(values):.2f} {unit}\n"
-        analysis += f"  • Median: {statistics.median(values):.2f} {unit}\n"
-        analysis += f"  • Std Deviation: {statistics.stdev(values):.2f} {unit}\n"
-        
+        analysis += f"  • Average: {entry['mean']:.2f} {unit}\n"
+        analysis += f"  • Minimum: {entry['min']:.2f} {unit}\n"
+        analysis += f"  • Maximum: {entry['max']:.2f} {unit}\n"
+        analysis += f"  • Median: {entry['median']:.2f} {unit}\n"
+        analysis += f"  • Std Deviation: {entry['std']:.2f} {unit}\n"
+
         # Air quality assessment for CO2
         if parameter.upper() == 'CO2':
-            avg_co2 = statistics.mean(values)
+            avg_co2 = entry['mean']
             analysis += f"\n**Air Quality Assessment:**\n"
             if avg_co2 < 400:
                 analysis += f"  • Excellent air quality ({avg_co2:.0f} ppm average)\n"
@@ -66,36 +120,36 @@ def analyze_historical_air_quality(parameter: str = "CO2", hours: int = 24) -> s
         
         # Show recent readings
         analysis += f"\n**Recent Readings:**\n"
-        for i, dp in enumerate(data_points[:5]):
-            analysis += f"  • {dp['time']}: {dp['value']} {unit}\n"
-        
+        for time_str, value in zip(entry['recent_times'], entry['recent_values']):
+            analysis += f"  • {time_str}: {value} {unit}\n"
+
         return analysis
-        
+
     except Exception as e:
         return f"Error analyzing historical data: {str(e)}"
 
 def compare_historical_vs_current(parameter: str = "CO2") -> str:
     """Compare historical air quality data with current IoT sensor readings"""
     # Get historical data
-    historical_data = get_historical_parameter_data(parameter)
-    current_data = get_current_parameter_data(parameter)
-    
-    if not historical_data or not current_data:
+    historical_data = np.asarray(get_historical_parameter_data(parameter), dtype=np.float32)
+    current_data = np.asarray(get_current_parameter_data(parameter), dtype=np.float32)
+
+    if historical_data.size == 0 or current_data.size == 0:
         return f"Insufficient data for {parameter} comparison."
-    
-    hist_avg = statistics.mean(historical_data)
-    curr_avg = statistics.mean(current_data)
-    
+
+    hist_avg = historical_data.mean()
+    curr_avg = current_data.mean()
+
     comparison = f"🔄 **Historical vs Current {parameter} Comparison**\n\n"
     comparison += f"**Historical Data (May 2025):**\n"
     comparison += f"  • Average: {hist_avg:.2f}\n"
-    comparison += f"  • Range: {min(historical_data):.2f} - {max(historical_data):.2f}\n"
-    comparison += f"  • Sample size: {len(historical_data):,} readings\n\n"
-    
+    comparison += f"  • Range: {historical_data.min():.2f} - {historical_data.max():.2f}\n"
+    comparison += f"  • Sample size: {historical_data.size:,} readings\n\n"
+
     comparison += f"**Current Data (Recent):**\n"
     comparison += f"  • Average: {curr_avg:.2f}\n"
-    comparison += f"  • Range: {min(current_data):.2f} - {max(current_data):.2f}\n"
-    comparison += f"  • Sample size: {len(current_data):,} readings\n\n"
+    comparison += f"  • Range: {current_data.min():.2f} - {current_data.max():.2f}\n"
+    comparison += f"  • Sample size: {current_data.size:,} readings\n\n"
     
     # Calculate difference
     diff = curr_avg - hist_avg
@@ -182,75 +236,50 @@ def get_air_quality_recommendations() -> str:
 def get_historical_parameter_data(parameter: str, max_lines: int = 5000) -> List[float]:
     """Extract historical data for a specific parameter from PT file"""
     file_path = r'c:\Users\USER\OneDrive\文件\capstone\PT_202505011759.txt'
-    values = []
-    
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f):
-                if line_num > max_lines:
-                    break
-                
-                parts = line.strip().split(', ')
-                if len(parts) >= 6:
-                    label = parts[3].split(': ')[1] if ': ' in parts[3] else ''
-                    if label.upper() == parameter.upper():
-                        try:
-                            value_str = parts[5].split(': ')[1]
-                            value = float(value_str)
-                            values.append(value)
-                        except (ValueError, IndexError):
-                            continue
-        return values
+        index = _load_pt_index(file_path, os.path.getmtime(file_path), max_lines)
+        entry = index.get(parameter.upper())
+        return entry['values'].tolist() if entry is not None else []
     except:
         return []
 
 def get_current_parameter_data(parameter: str) -> List[float]:
     """Extract current data for a specific parameter from IoT database"""
-    import sqlite3
-    
-    db_path = r'c:\Users\USER\OneDrive\文件\capstone\SML_STEM_IoT.db'
     values = []
-    
+
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
+        cursor = get_db_connection().cursor()
+
         # Get recent data (last 1000 readings)
         cursor.execute("""
-            SELECT value FROM data 
-            WHERE parameter = ? 
-            ORDER BY timestamp DESC 
+            SELECT value FROM data
+            WHERE parameter = ?
+            ORDER BY timestamp DESC
             LIMIT 1000;
         """, (parameter,))
-        
-        results = cursor.fetchall()
-        values = [row[0] for row in results]
-        conn.close()
-        
+
+        values = [row[0] for row in cursor.fetchall()]
+
     except:
         pass
-    
+
     return values
 
+@cached_with_ttl(30)
 def get_current_average_parameter(parameter: str) -> Optional[float]:
     """Get current average value for a parameter"""
-    import sqlite3
-    
-    db_path = r'c:\Users\USER\OneDrive\文件\capstone\SML_STEM_IoT.db'
-    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
+        cursor = get_db_connection().cursor()
+
         cursor.execute("""
-            SELECT AVG(value) FROM data 
-            WHERE parameter = ? 
+            SELECT AVG(value) FROM data
+            WHERE parameter = ?
             AND timestamp > (SELECT MAX(timestamp) - 3600000 FROM data WHERE parameter = ?);
         """, (parameter, parameter))
-        
+
         result = cursor.fetchone()
-        conn.close()
-        
+
         return result[0] if result and result[0] else None
     except:
         return None 
\ No newline at end of file
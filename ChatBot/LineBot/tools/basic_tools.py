@@ -1,11 +1,74 @@
+import ast
+import functools
+import operator
 from datetime import datetime
 import pytz
 import requests
+from requests.adapters import HTTPAdapter
+
+from .smart_home_tools import cached_with_ttl
+
+VANCOUVER_TZ = pytz.timezone('America/Vancouver')
+
+# Keep-alive session so repeated weather lookups reuse one TCP/TLS connection
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+@functools.lru_cache(maxsize=256)
+def _geocode(city: str):
+    """Resolve a city to (lat, lon) once; coordinates don't move
+
+    Raises LookupError when the API returns no match, so only successful
+    lookups are memoized and a transient empty response is retried next call.
+    """
+    geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={city}&count=1"
+    geo_data = _session.get(geo_url, timeout=5).json()
+    if not geo_data.get('results'):
+        raise LookupError(f"no geocoding results for {city}")
+    return geo_data['results'][0]['latitude'], geo_data['results'][0]['longitude']
+
+@cached_with_ttl(600)
+def _current_weather(lat, lon):
+    """Fetch (temperature, windspeed); cached briefly, weather doesn't change minute to minute
+
+    Raises LookupError on a response without current_weather; exceptions skip
+    the TTL cache, so one malformed response isn't pinned for ten minutes.
+    """
+    weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
+    weather_data = _session.get(weather_url, timeout=5).json()
+    if 'current_weather' not in weather_data:
+        raise LookupError(f"no current weather for ({lat}, {lon})")
+    return weather_data['current_weather']['temperature'], weather_data['current_weather']['windspeed']
+
+# Operators the calculator accepts; anything else fails closed
+_SAFE_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+@functools.lru_cache(maxsize=256)
+def _parse_expression(expression: str) -> ast.Expression:
+    """Parse an arithmetic expression once per distinct string"""
+    return ast.parse(expression, mode='eval')
+
+def _eval_node(node):
+    """Evaluate a parsed arithmetic node using only the whitelisted operators"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _SAFE_OPS:
+        return _SAFE_OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _SAFE_OPS:
+        return _SAFE_OPS[type(node.op)](_eval_node(node.operand))
+    raise ValueError("Unsupported expression")
 
 def get_current_time() -> str:
     """Get the current time in Vancouver timezone"""
-    vancouver_tz = pytz.timezone('America/Vancouver')
-    current_time = datetime.now(vancouver_tz)
+    current_time = datetime.now(VANCOUVER_TZ)
     return f"Current time in Vancouver: {current_time.strftime('%Y-%m-%d %H:%M:%S %Z')}"
 
 def calculate(expression: str) -> str:
@@ -13,7 +76,10 @@ def calculate(expression: str) -> str:
     try:
         allowed_chars = "0123456789+-*/()., "
         if all(c in allowed_chars for c in expression):
-            result = eval(expression)
+            # Walk the parsed AST instead of eval(): no code execution, and
+            # repeat expressions reuse the cached parse. strip() because
+            # ast.parse rejects leading whitespace that eval() tolerated
+            result = _eval_node(_parse_expression(expression.strip()).body)
             return f"Result: {result}"
         else:
             return "Error: Invalid characters in expression"
@@ -23,22 +89,16 @@ def calculate(expression: str) -> str:
 def get_weather(city: str = "Vancouver") -> str:
     """Get current weather for a city using Open-Meteo API (no key required)"""
     try:
-        # Geocoding to get latitude/longitude
-        geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={city}&count=1"
-        geo_resp = requests.get(geo_url, timeout=5)
-        geo_data = geo_resp.json()
-        if not geo_data.get('results'):
+        # Geocoding to get latitude/longitude (cached per city)
+        try:
+            coords = _geocode(city)
+        except LookupError:
             return f"Could not find location for {city}."
-        lat = geo_data['results'][0]['latitude']
-        lon = geo_data['results'][0]['longitude']
-        # Get current weather
-        weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-        weather_resp = requests.get(weather_url, timeout=5)
-        weather_data = weather_resp.json()
-        if 'current_weather' not in weather_data:
+        # Get current weather (cached for 10 minutes per location)
+        try:
+            temp, wind = _current_weather(*coords)
+        except LookupError:
             return f"Could not get weather data for {city}."
-        temp = weather_data['current_weather']['temperature']
-        wind = weather_data['current_weather']['windspeed']
         desc = f"Current temperature in {city}: {temp}°C, wind speed: {wind} km/h."
         return desc
     except Exception as e:
@@ -1,10 +1,155 @@
 # This is a mock implementation - replace with actual IoT integration
+import bisect
+import functools
 import json
+import time
 from typing import Dict, Any
 import sqlite3
 import os
 from datetime import datetime, timedelta
-import statistics
+
+import numpy as np
+
+DB_PATH = r'c:\Users\USER\OneDrive\文件\capstone\SML_STEM_IoT.db'
+
+def cached_with_ttl(ttl_seconds):
+    """Cache a function's result per arguments for ttl_seconds.
+
+    Sensor data only changes at sensor cadence, so bursty chat traffic within
+    one tick reuses a single database read instead of re-querying per message.
+    """
+    def decorator(func):
+        cache = {}
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = cache.get(args)
+            if hit is not None and now - hit[0] < ttl_seconds:
+                return hit[1]
+            value = func(*args)
+            cache[args] = (now, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+_conn = None
+
+def get_db_connection():
+    """Shared read-mostly SQLite connection, opened and tuned once per process
+
+    Reconnecting per tool call paid file-open, schema parse and a cold page
+    cache every time; WAL + a larger cache + mmap let repeated reads skip
+    syscalls entirely.
+    """
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA cache_size=-64000")
+        _conn.execute("PRAGMA mmap_size=268435456")
+        # Covering index so the latest-reading window scan is O(groups)
+        # instead of a double full-table pass
+        _conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_data_sensor_param_ts "
+            "ON data(sensor, parameter, timestamp DESC)"
+        )
+    return _conn
+
+# Latest reading per (sensor, parameter) via a ranked window instead of the
+# old correlated (sensor, parameter, timestamp) IN (SELECT ... MAX(...)) form,
+# which scanned the table twice
+_LATEST_READINGS_CTE = """
+    WITH ranked AS (
+        SELECT sensor, parameter, value, timestamp,
+               ROW_NUMBER() OVER (
+                   PARTITION BY sensor, parameter
+                   ORDER BY timestamp DESC
+               ) AS rn
+        FROM data
+    )
+"""
+LATEST_BY_SENSOR_SQL = _LATEST_READINGS_CTE + """
+    SELECT sensor, parameter, value, datetime(timestamp/1000, 'unixepoch') as readable_time
+    FROM ranked
+    WHERE rn = 1
+    ORDER BY sensor, parameter;
+"""
+LATEST_BY_PARAMETER_SQL = _LATEST_READINGS_CTE + """
+    SELECT sensor, parameter, value
+    FROM ranked
+    WHERE rn = 1
+    ORDER BY parameter, sensor;
+"""
+
+# Air-quality status bands; bisect picks the band index instead of walking an
+# if/elif chain per reading
+CO2_BANDS = (400, 600, 800, 1200)
+CO2_STATUS = (
+    "  • CO2: Excellent ({avg:.0f} ppm)\n",
+    "  • CO2: Good ({avg:.0f} ppm)\n",
+    "  • CO2: Moderate ({avg:.0f} ppm)\n",
+    "  • CO2: Poor ({avg:.0f} ppm) - Consider ventilation\n",
+    "  • CO2: Very Poor ({avg:.0f} ppm) - Immediate ventilation needed\n",
+)
+TVOC_BANDS = (10, 50)
+TVOC_STATUS = (
+    "  • TVOC: Excellent ({avg:.0f})\n",
+    "  • TVOC: Good ({avg:.0f})\n",
+    "  • TVOC: Elevated ({avg:.0f}) - Check for sources\n",
+)
+
+# Display units per parameter, built once instead of per lookup
+PARAMETER_UNITS = {
+    'CO2': ' ppm',
+    'Temperature': '°C',
+    'Humidity': '%',
+    'TVOC': ''
+}
+
+# Alert thresholds, built once instead of per check_environmental_alerts call
+ALERT_THRESHOLDS = {
+    'CO2': {'warning': 800, 'critical': 1200},
+    'Temperature': {'low': 18, 'high': 28},
+    'Humidity': {'low': 30, 'high': 60},
+    'TVOC': {'warning': 50, 'critical': 100}
+}
+
+# Severity is decided inside SQLite so only breaching rows are materialized in
+# Python — normally an empty result set
+ALERTING_READINGS_SQL = _LATEST_READINGS_CTE + f"""
+    SELECT sensor, parameter, value, severity
+    FROM (
+        SELECT sensor, parameter, value,
+               CASE
+                   WHEN parameter = 'CO2' AND value >= {ALERT_THRESHOLDS['CO2']['critical']} THEN 'critical'
+                   WHEN parameter = 'CO2' AND value >= {ALERT_THRESHOLDS['CO2']['warning']} THEN 'warning'
+                   WHEN parameter = 'Temperature' AND value <= {ALERT_THRESHOLDS['Temperature']['low']} THEN 'low'
+                   WHEN parameter = 'Temperature' AND value >= {ALERT_THRESHOLDS['Temperature']['high']} THEN 'high'
+                   WHEN parameter = 'Humidity' AND value <= {ALERT_THRESHOLDS['Humidity']['low']} THEN 'low'
+                   WHEN parameter = 'Humidity' AND value >= {ALERT_THRESHOLDS['Humidity']['high']} THEN 'high'
+                   WHEN parameter = 'TVOC' AND value >= {ALERT_THRESHOLDS['TVOC']['critical']} THEN 'critical'
+                   WHEN parameter = 'TVOC' AND value >= {ALERT_THRESHOLDS['TVOC']['warning']} THEN 'warning'
+               END AS severity
+        FROM ranked
+        WHERE rn = 1
+    )
+    WHERE severity IS NOT NULL;
+"""
+
+# Message per (parameter, severity); the wording matches the old if-tree
+ALERT_MESSAGES = {
+    ('CO2', 'critical'): f"🚨 CRITICAL: Sensor {{sensor}} CO2 level is {{value}} ppm (>= {ALERT_THRESHOLDS['CO2']['critical']})",
+    ('CO2', 'warning'): f"⚠️ WARNING: Sensor {{sensor}} CO2 level is {{value}} ppm (>= {ALERT_THRESHOLDS['CO2']['warning']})",
+    ('Temperature', 'low'): f"🌡️ LOW: Sensor {{sensor}} temperature is {{value}}°C (<= {ALERT_THRESHOLDS['Temperature']['low']})",
+    ('Temperature', 'high'): f"🌡️ HIGH: Sensor {{sensor}} temperature is {{value}}°C (>= {ALERT_THRESHOLDS['Temperature']['high']})",
+    ('Humidity', 'low'): f"💧 LOW: Sensor {{sensor}} humidity is {{value}}% (<= {ALERT_THRESHOLDS['Humidity']['low']})",
+    ('Humidity', 'high'): f"💧 HIGH: Sensor {{sensor}} humidity is {{value}}% (>= {ALERT_THRESHOLDS['Humidity']['high']})",
+    ('TVOC', 'critical'): f"🚨 CRITICAL: Sensor {{sensor}} TVOC level is {{value}} (>= {ALERT_THRESHOLDS['TVOC']['critical']})",
+    ('TVOC', 'warning'): f"⚠️ WARNING: Sensor {{sensor}} TVOC level is {{value}} (>= {ALERT_THRESHOLDS['TVOC']['warning']})",
+}
 
 # Mock device states
 device_states = {
@@ -48,28 +193,16 @@ def control_door(action: str) -> str:
     else:
         return "Invalid action. Use 'open' or 'close'"
 
+@cached_with_ttl(30)
 def get_current_environmental_status() -> str:
     """Get current environmental readings from all IoT sensors"""
-    db_path = r'c:\Users\USER\OneDrive\文件\capstone\SML_STEM_IoT.db'
-    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = get_db_connection().cursor()
         
         # Get latest readings for each parameter from all sensors
-        cursor.execute("""
-            SELECT sensor, parameter, value, datetime(timestamp/1000, 'unixepoch') as readable_time
-            FROM data 
-            WHERE (sensor, parameter, timestamp) IN (
-                SELECT sensor, parameter, MAX(timestamp)
-                FROM data 
-                GROUP BY sensor, parameter
-            )
-            ORDER BY sensor, parameter;
-        """)
+        cursor.execute(LATEST_BY_SENSOR_SQL)
         
         results = cursor.fetchall()
-        conn.close()
         
         if not results:
             return "No current environmental data available."
@@ -100,11 +233,8 @@ def get_current_environmental_status() -> str:
 
 def get_environmental_trends(hours: int = 24) -> str:
     """Get environmental trends over the last N hours"""
-    db_path = r'c:\Users\USER\OneDrive\文件\capstone\SML_STEM_IoT.db'
-    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = get_db_connection().cursor()
         
         # Calculate timestamp for N hours ago
         hours_ago_ms = int((datetime.now().timestamp() - (hours * 3600)) * 1000)
@@ -119,7 +249,6 @@ def get_environmental_trends(hours: int = 24) -> str:
         """, (hours_ago_ms,))
         
         results = cursor.fetchall()
-        conn.close()
         
         if not results:
             return f"No environmental data available for the last {hours} hours."
@@ -137,65 +266,21 @@ def get_environmental_trends(hours: int = 24) -> str:
     except Exception as e:
         return f"Error retrieving trend data: {str(e)}"
 
+@cached_with_ttl(30)
 def check_environmental_alerts() -> str:
     """Check for environmental alerts based on thresholds"""
-    db_path = r'c:\Users\USER\OneDrive\文件\capstone\SML_STEM_IoT.db'
-    
-    # Define thresholds
-    thresholds = {
-        'CO2': {'warning': 800, 'critical': 1200},
-        'Temperature': {'low': 18, 'high': 28},
-        'Humidity': {'low': 30, 'high': 60},
-        'TVOC': {'warning': 50, 'critical': 100}
-    }
-    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Get latest readings
-        cursor.execute("""
-            SELECT sensor, parameter, value, datetime(timestamp/1000, 'unixepoch') as readable_time
-            FROM data 
-            WHERE (sensor, parameter, timestamp) IN (
-                SELECT sensor, parameter, MAX(timestamp)
-                FROM data 
-                GROUP BY sensor, parameter
-            )
-        """)
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        alerts = []
-        for sensor, param, value, time in results:
-            if param in thresholds:
-                threshold = thresholds[param]
-                
-                if param == 'CO2':
-                    if value >= threshold['critical']:
-                        alerts.append(f"🚨 CRITICAL: Sensor {sensor} CO2 level is {value} ppm (>= {threshold['critical']})")
-                    elif value >= threshold['warning']:
-                        alerts.append(f"⚠️ WARNING: Sensor {sensor} CO2 level is {value} ppm (>= {threshold['warning']})")
-                
-                elif param == 'Temperature':
-                    if value <= threshold['low']:
-                        alerts.append(f"🌡️ LOW: Sensor {sensor} temperature is {value}°C (<= {threshold['low']})")
-                    elif value >= threshold['high']:
-                        alerts.append(f"🌡️ HIGH: Sensor {sensor} temperature is {value}°C (>= {threshold['high']})")
-                
-                elif param == 'Humidity':
-                    if value <= threshold['low']:
-                        alerts.append(f"💧 LOW: Sensor {sensor} humidity is {value}% (<= {threshold['low']})")
-                    elif value >= threshold['high']:
-                        alerts.append(f"💧 HIGH: Sensor {sensor} humidity is {value}% (>= {threshold['high']})")
-                
-                elif param == 'TVOC':
-                    if value >= threshold['critical']:
-                        alerts.append(f"🚨 CRITICAL: Sensor {sensor} TVOC level is {value} (>= {threshold['critical']})")
-                    elif value >= threshold['warning']:
-                        alerts.append(f"⚠️ WARNING: Sensor {sensor} TVOC level is {value} (>= {threshold['warning']})")
-        
+        cursor = get_db_connection().cursor()
+
+        # The database classifies the latest readings; Python only formats
+        # the (usually empty) breaching rows
+        cursor.execute(ALERTING_READINGS_SQL)
+
+        alerts = [
+            ALERT_MESSAGES[param, severity].format(sensor=sensor, value=value)
+            for sensor, param, value, severity in cursor.fetchall()
+        ]
+
         if alerts:
             return "🚨 **Environmental Alerts**\n\n" + "\n".join(alerts)
         else:
@@ -206,26 +291,13 @@ def check_environmental_alerts() -> str:
 
 def compare_sensors() -> str:
     """Compare readings across different sensors"""
-    db_path = r'c:\Users\USER\OneDrive\文件\capstone\SML_STEM_IoT.db'
-    
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = get_db_connection().cursor()
         
         # Get latest readings for comparison
-        cursor.execute("""
-            SELECT sensor, parameter, value
-            FROM data 
-            WHERE (sensor, parameter, timestamp) IN (
-                SELECT sensor, parameter, MAX(timestamp)
-                FROM data 
-                GROUP BY sensor, parameter
-            )
-            ORDER BY parameter, sensor;
-        """)
+        cursor.execute(LATEST_BY_PARAMETER_SQL)
         
         results = cursor.fetchall()
-        conn.close()
         
         # Organize by parameter
         param_data = {}
@@ -238,9 +310,9 @@ def compare_sensors() -> str:
         for param, sensors in param_data.items():
             if len(sensors) > 1:
                 unit = get_unit_for_parameter(param)
-                values = list(sensors.values())
-                avg_val = statistics.mean(values)
-                std_dev = statistics.stdev(values) if len(values) > 1 else 0
+                values = np.fromiter(sensors.values(), dtype=np.float32)
+                avg_val = values.mean()
+                std_dev = values.std(ddof=1) if values.size > 1 else 0
                 
                 comparison += f"**{param}:**\n"
                 for sensor_id, value in sorted(sensors.items()):
@@ -255,13 +327,7 @@ def compare_sensors() -> str:
 
 def get_unit_for_parameter(param: str) -> str:
     """Get the appropriate unit for each parameter"""
-    units = {
-        'CO2': ' ppm',
-        'Temperature': '°C',
-        'Humidity': '%',
-        'TVOC': ''
-    }
-    return units.get(param, '')
+    return PARAMETER_UNITS.get(param, '')
 
 def get_air_quality_assessment(sensors_data: Dict) -> str:
     """Provide air quality assessment based on current readings"""
@@ -278,25 +344,11 @@ def get_air_quality_assessment(sensors_data: Dict) -> str:
     assessment = "🌿 **Air Quality Assessment:**\n"
     
     if all_co2:
-        avg_co2 = statistics.mean(all_co2)
-        if avg_co2 < 400:
-            assessment += f"  • CO2: Excellent ({avg_co2:.0f} ppm)\n"
-        elif avg_co2 < 600:
-            assessment += f"  • CO2: Good ({avg_co2:.0f} ppm)\n"
-        elif avg_co2 < 800:
-            assessment += f"  • CO2: Moderate ({avg_co2:.0f} ppm)\n"
-        elif avg_co2 < 1200:
-            assessment += f"  • CO2: Poor ({avg_co2:.0f} ppm) - Consider ventilation\n"
-        else:
-            assessment += f"  • CO2: Very Poor ({avg_co2:.0f} ppm) - Immediate ventilation needed\n"
-    
+        avg_co2 = np.fromiter(all_co2, dtype=np.float32).mean()
+        assessment += CO2_STATUS[bisect.bisect_right(CO2_BANDS, avg_co2)].format(avg=avg_co2)
+
     if all_tvoc:
-        avg_tvoc = statistics.mean(all_tvoc)
-        if avg_tvoc < 10:
-            assessment += f"  • TVOC: Excellent ({avg_tvoc:.0f})\n"
-        elif avg_tvoc < 50:
-            assessment += f"  • TVOC: Good ({avg_tvoc:.0f})\n"
-        else:
-            assessment += f"  • TVOC: Elevated ({avg_tvoc:.0f}) - Check for sources\n"
+        avg_tvoc = np.fromiter(all_tvoc, dtype=np.float32).mean()
+        assessment += TVOC_STATUS[bisect.bisect_right(TVOC_BANDS, avg_tvoc)].format(avg=avg_tvoc)
     
     return assessment
\ No newline at end of file
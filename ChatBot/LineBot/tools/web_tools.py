@@ -1,20 +1,25 @@
+from django.db.models import Count, Max, Min
+
 from LineBot.models import User_Info
 import json
 
 def get_user_statistics(user_id: str) -> str:
     """Get statistics about user's interactions"""
     try:
-        total_messages = User_Info.objects.filter(uid=user_id).count()
-        first_message = User_Info.objects.filter(uid=user_id).first()
-        last_message = User_Info.objects.filter(uid=user_id).last()
-        
+        # One aggregate round-trip instead of count()/first()/last()
+        agg = User_Info.objects.filter(uid=user_id).aggregate(
+            total=Count('pk'), first=Min('mdt'), last=Max('mdt')
+        )
+
         stats = {
-            "total_messages": total_messages,
-            "first_interaction": str(first_message.mdt) if first_message else None,
-            "last_interaction": str(last_message.mdt) if last_message else None
+            "total_messages": agg['total'],
+            "first_interaction": str(agg['first']) if agg['first'] else None,
+            "last_interaction": str(agg['last']) if agg['last'] else None
         }
         
-        return json.dumps(stats, indent=2)
+        # Compact separators: this string goes back into the model's context,
+        # and indented JSON just inflates the token count
+        return json.dumps(stats, ensure_ascii=False, separators=(',', ':'))
     except Exception as e:
         return f"Error getting statistics: {str(e)}"
 
@@ -8,10 +8,27 @@ from .agent.model_hub import ModelHub
 from .agent.tool_manager import ToolManager
 import json
 import logging
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
-agent_cache = {}
+# Per-user agents (and the conversation state they hold) in LRU order, so an
+# unbounded stream of user_ids cannot grow the process without limit
+AGENT_CACHE_MAX_USERS = 1024
+agent_cache = OrderedDict()
+
+# One ModelHub (and its OpenAI HTTP connection pool) and one ToolManager for
+# the whole process; building them per user repeats TLS handshakes and setup
+_shared_model_hub = None
+_shared_tool_manager = None
+
+def get_shared_components():
+    """Get the process-wide ModelHub and ToolManager, creating them on first use"""
+    global _shared_model_hub, _shared_tool_manager
+    if _shared_model_hub is None:
+        _shared_model_hub = ModelHub()
+        _shared_tool_manager = ToolManager()
+    return _shared_model_hub, _shared_tool_manager
 
 def chat_interface(request):
     """Render the chat interface"""
@@ -56,22 +73,25 @@ def chat_api(request):
             user_id = data.get('user_id', 'web_user')
             message = data.get('message', '')
             
-            logger.info(f"🌐 WEB INTERFACE REQUEST\nUser ID: {user_id}\nMessage: {message[:100]}{'...' if len(message) > 100 else ''}")
+            logger.info("🌐 WEB INTERFACE REQUEST\nUser ID: %s\nMessage: %.100s%s", user_id, message, '...' if len(message) > 100 else '')
             
             if user_id not in agent_cache:
-                logger.info(f"🚀 CREATING NEW SIMPLE AGENT INSTANCE for user: {user_id}")
-                model_hub = ModelHub()
-                tool_manager = ToolManager()
+                logger.info("🚀 CREATING NEW SIMPLE AGENT INSTANCE for user: %s", user_id)
+                model_hub, tool_manager = get_shared_components()
                 # Using SimpleAgent instead of ReActAgent to leverage native ReAct capabilities
                 agent_cache[user_id] = SimpleAgent(model_hub, tool_manager)
+                if len(agent_cache) > AGENT_CACHE_MAX_USERS:
+                    evicted_id, _ = agent_cache.popitem(last=False)
+                    logger.info("🗑️ EVICTED LEAST RECENTLY USED AGENT for user: %s", evicted_id)
             else:
-                logger.info(f"♻️ REUSING EXISTING SIMPLE AGENT INSTANCE for user: {user_id}")
-            
+                logger.info("♻️ REUSING EXISTING SIMPLE AGENT INSTANCE for user: %s", user_id)
+                agent_cache.move_to_end(user_id)
+
             agent = agent_cache[user_id]
             
             logger.info("🎯 STARTING AGENT PROCESSING...")
             response = agent.process_message(message)
-            logger.info(f"✅ AGENT PROCESSING COMPLETED\nResponse length: {len(response)} characters")
+            logger.info("✅ AGENT PROCESSING COMPLETED\nResponse length: %d characters", len(response))
             
             # Save to database - fixed to match model fields
             User_Info.objects.create(
@@ -89,7 +109,7 @@ def chat_api(request):
             })
             
         except Exception as e:
-            logger.error(f"❌ WEB API ERROR: {str(e)}")
+            logger.error("❌ WEB API ERROR: %s", e)
             return JsonResponse({
                 'status': 'error',
                 'response': f'Error: {str(e)}'
@@ -99,7 +119,7 @@ def chat_api(request):
 
 def clear_memory(request):
     """Clear agent memory for testing"""
-    logger.info(f"🧹 CLEARING AGENT CACHE\nCached agents: {len(agent_cache)}")
+    logger.info("🧹 CLEARING AGENT CACHE\nCached agents: %d", len(agent_cache))
     agent_cache.clear()
     logger.info("✅ AGENT CACHE CLEARED")
     return JsonResponse({'status': 'success', 'message': 'Memory cleared'})
@@ -110,7 +130,7 @@ def get_chat_history(request):
         user_id = request.GET.get('user_id', 'web_user')
         limit = int(request.GET.get('limit', 10))
         
-        logger.info(f"📚 CHAT HISTORY REQUEST\nUser ID: {user_id}\nLimit: {limit}")
+        logger.info("📚 CHAT HISTORY REQUEST\nUser ID: %s\nLimit: %d", user_id, limit)
         
         messages = User_Info.objects.filter(uid=user_id).order_by('-mdt')[:limit]
         
@@ -129,7 +149,7 @@ def get_chat_history(request):
                     'timestamp': msg.mdt.isoformat()
                 })
         
-        logger.info(f"📖 CHAT HISTORY RETRIEVED\nMessages found: {len(messages)}\nHistory items: {len(history)}")
+        logger.info("📖 CHAT HISTORY RETRIEVED\nMessages found: %d\nHistory items: %d", len(messages), len(history))
         
         return JsonResponse({
             'status': 'success',
@@ -137,7 +157,7 @@ def get_chat_history(request):
         })
         
     except Exception as e:
-        logger.error(f"❌ CHAT HISTORY ERROR: {str(e)}")
+        logger.error("❌ CHAT HISTORY ERROR: %s", e)
         return JsonResponse({
             'status': 'error',
             'message': f'Error: {str(e)}'
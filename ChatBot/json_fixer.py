@@ -7,6 +7,16 @@ Finds and fixes JSON syntax errors in your manual evaluation file
 import json
 import re
 
+# Compiled once at import time; the fixer gets rerun repeatedly while
+# iterating on a broken evaluation file
+UNQUOTED_VALUE_COMMA_RE = re.compile(r':\s*([a-zA-Z0-9\-]+),')
+UNQUOTED_VALUE_BRACE_RE = re.compile(r':\s*([a-zA-Z0-9\-]+)(\s*})')
+MISSING_COMMA_RE = re.compile(r'(\d+)\s*"reasoning_score"')
+REASONING_URL_RE = re.compile(
+    r'"reasoning": "\{.*?https://www\.co2meter\.com.*?"',
+    re.DOTALL
+)
+
 def fix_json_file():
     """Fix JSON syntax errors in the manual evaluation file"""
     
@@ -43,11 +53,11 @@ def fix_json_file():
         print(f"\n🔧 Applying common JSON fixes...")
         
         # Fix 1: Missing quotes around values
-        content = re.sub(r':\s*([a-zA-Z0-9\-]+),', r': "\1",', content)
-        content = re.sub(r':\s*([a-zA-Z0-9\-]+)(\s*})', r': "\1"\2', content)
-        
+        content = UNQUOTED_VALUE_COMMA_RE.sub(r': "\1",', content)
+        content = UNQUOTED_VALUE_BRACE_RE.sub(r': "\1"\2', content)
+
         # Fix 2: Missing commas after scores
-        content = re.sub(r'(\d+)\s*"reasoning_score"', r'\1,\n      "reasoning_score"', content)
+        content = MISSING_COMMA_RE.sub(r'\1,\n      "reasoning_score"', content)
         
         # Fix 3: Fix specific known issues
         content = content.replace('"preferred_model": o4-mini', '"preferred_model": "o4-mini"')
@@ -55,11 +65,9 @@ def fix_json_file():
         content = content.replace('"preferred_model": gpt-4.1-mini', '"preferred_model": "gpt-4.1-mini"')
         
         # Fix 4: Clean up the reasoning field that has URL data
-        content = re.sub(
-            r'"reasoning": "\{.*?https://www\.co2meter\.com.*?"',
+        content = REASONING_URL_RE.sub(
             '"reasoning": "CO2 standards reference from official documentation - reasoning model provided accurate assessment"',
-            content,
-            flags=re.DOTALL
+            content
         )
         
         # Try to parse again
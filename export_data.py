@@ -119,17 +119,22 @@ def export_to_json(output_file='iot_data_complete.json', limit=10000):
     LIMIT ?
     """
     
-    df = pd.read_sql_query(query, conn, params=(limit,))
-    
-    # Convert to JSON
-    data = df.to_dict('records')
-    
+    # Stream records chunk by chunk instead of materializing the whole
+    # dataset as one list before serializing it
+    total = 0
     with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
-    
+        f.write('[\n')
+        for chunk in pd.read_sql_query(query, conn, params=(limit,), chunksize=1000):
+            for record in chunk.to_dict('records'):
+                if total:
+                    f.write(',\n')
+                f.write(json.dumps(record, default=str))
+                total += 1
+        f.write('\n]')
+
     conn.close()
-    
-    print(f"✅ Exported {len(df):,} records to {output_file}")
+
+    print(f"✅ Exported {total:,} records to {output_file}")
     return output_file
 
 def export_summary_stats():
@@ -1,6 +1,7 @@
 import sqlite3
 import csv
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 def export_all_data_to_csv():
@@ -271,10 +272,17 @@ def main():
             export_recent_data()
         elif choice == '6':
             print("\nExporting all formats...")
-            export_summary_stats()
-            export_recent_data()
-            export_by_parameter()
-            export_by_sensor()
+            # Each export opens its own SQLite connection, so the four
+            # independent exports can run in parallel threads
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [
+                    executor.submit(export_summary_stats),
+                    executor.submit(export_recent_data),
+                    executor.submit(export_by_parameter),
+                    executor.submit(export_by_sensor),
+                ]
+                for future in futures:
+                    future.result()
             print("\n✓ All exports completed!")
         elif choice == '0':
             print("Goodbye!")